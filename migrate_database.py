@@ -5,12 +5,11 @@ Run this once to update your database schema
 
 import sys
 import os
-from sqlalchemy import text
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from src.db.database import engine, SessionLocal
+from src.db.migrations import apply_ddl, create_indexes_concurrently
 
 
 def migrate_database():
@@ -23,26 +22,29 @@ def migrate_database():
         "ALTER TABLE observations ADD COLUMN IF NOT EXISTS calib_level INTEGER;",
         "ALTER TABLE observations ADD COLUMN IF NOT EXISTS wavelength_region VARCHAR;",
         "ALTER TABLE observations ADD COLUMN IF NOT EXISTS pi_name VARCHAR;",
-        "ALTER TABLE observations ADD COLUMN IF NOT EXISTS target_classification VARCHAR;",
-        "CREATE INDEX IF NOT EXISTS idx_observations_filter_name ON observations(filter_name);",
-        "CREATE INDEX IF NOT EXISTS idx_observations_proposal_id ON observations(proposal_id);"
+        "ALTER TABLE observations ADD COLUMN IF NOT EXISTS target_classification VARCHAR;"
+    ]
+    indexes = [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_observations_filter_name ON observations(filter_name);",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_observations_proposal_id ON observations(proposal_id);"
     ]
     
     try:
-        db = SessionLocal()
-        print("Database connection established!")
+        for i, migration in enumerate(migrations + indexes, 1):
+            print(f"[{i}/{len(migrations) + len(indexes)}] Queued: {migration[:60]}...")
+        
+        # One transaction, one round-trip: all statements apply or none do
+        apply_ddl(migrations)
+        print(f"    ✓ Applied {len(migrations)} statements")
         
-        for i, migration in enumerate(migrations, 1):
-            print(f"[{i}/{len(migrations)}] Executing: {migration[:60]}...")
-            db.execute(text(migration))
-            db.commit()
-            print(f"    ✓ Success")
+        # Indexes build outside the transaction so the table stays writable
+        for name in create_indexes_concurrently(indexes):
+            print(f"    ✓ Rebuilt invalid index {name}")
+        print(f"    ✓ Built {len(indexes)} indexes concurrently")
         
         print("\n✅ Migration completed successfully!")
         print("Your database now has all the new fields.")
         
-        db.close()
-        
     except Exception as e:
         print(f"\n❌ Migration failed: {e}")
         import traceback
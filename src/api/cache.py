@@ -0,0 +1,50 @@
+"""
+Response cache for the read-only aggregate endpoints.
+
+Uses Redis when REDIS_URL is set so every worker shares one cache and the
+ingest job can invalidate it; otherwise falls back to a per-process
+in-memory cache that nothing can invalidate, so it expires sooner.
+"""
+
+import hashlib
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+
+from src.config import REDIS_URL
+
+CACHE_PREFIX = "jwst"
+# Seconds; observations only change when the ingest job runs, which clears
+# Redis but cannot reach another process's memory
+CACHE_EXPIRE = 3600 if REDIS_URL else 300
+
+
+def request_key_builder(func, namespace="", request=None, response=None, args=None, kwargs=None):
+    """Key on route + sorted query params only (the db session kwarg differs per call)"""
+    params = sorted(request.query_params.multi_items()) if request else []
+    path = request.url.path if request else func.__name__
+    digest = hashlib.md5(f"{path}:{params}".encode()).hexdigest()
+    return f"{FastAPICache.get_prefix()}:{namespace}:{digest}"
+
+
+def init_cache():
+    """Initialize FastAPICache with Redis if configured, else in-memory"""
+    if REDIS_URL:
+        from redis import asyncio as aioredis
+        from fastapi_cache.backends.redis import RedisBackend
+        backend = RedisBackend(aioredis.from_url(REDIS_URL))
+    else:
+        backend = InMemoryBackend()
+    FastAPICache.init(backend, prefix=CACHE_PREFIX, key_builder=request_key_builder)
+
+
+def clear_response_cache():
+    """Drop cached responses after new observations are committed (Redis only)"""
+    if not REDIS_URL:
+        return 0
+    import redis
+    client = redis.Redis.from_url(REDIS_URL)
+    keys = list(client.scan_iter(f"{CACHE_PREFIX}:*"))
+    if keys:
+        client.delete(*keys)
+    return len(keys)
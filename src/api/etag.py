@@ -0,0 +1,62 @@
+"""
+Conditional GET support for the read-only API.
+
+Hashes each successful GET response body into a strong ETag and answers
+304 Not Modified when the client already holds that version, so repeat
+polls don't resend payloads that only change when the ingest job runs.
+"""
+
+import hashlib
+
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+
+# Responses that must never be reused by clients
+UNCACHED_PATHS = {"/health", "/health/deep", "/observations/random"}
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header (possibly a list, possibly weak) against an ETag"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class ETagMiddleware(BaseHTTPMiddleware):
+    """Add ETag/Cache-Control to GET responses and short-circuit matching revalidations"""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        
+        if (
+            request.method != "GET"
+            or response.status_code != 200
+            or request.url.path in UNCACHED_PATHS
+        ):
+            return response
+        
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = compute_etag(body)
+        # Raw headers keep repeated fields (Vary, Set-Cookie) that a dict would collapse
+        headers = MutableHeaders(raw=list(response.raw_headers))
+        headers["etag"] = etag
+        # Overrides the max-age fastapi-cache sets from its server-side expiry
+        headers["cache-control"] = CACHE_CONTROL
+        
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            # Keep the CORS and Vary headers the inner layers added; only the
+            # body description goes
+            del headers["content-length"]
+            del headers["content-type"]
+            return Response(status_code=304, headers=headers)
+        
+        return Response(content=body, status_code=response.status_code, headers=headers)
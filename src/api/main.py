@@ -1,24 +1,48 @@
-from fastapi import FastAPI, Depends, HTTPException, Query
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_, or_
+from fastapi.responses import ORJSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from fastapi_cache.decorator import cache
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, lambda_stmt, func, desc, and_, or_, tuple_, text
 from typing import Optional, List
 from datetime import datetime, timedelta
-import random
+import base64
+import binascii
 import math
 
-from src.db.database import get_db, init_db
-from src.db.models import JWSTObservation
+import numpy as np
+import orjson
+
+from src.api.cache import init_cache, CACHE_EXPIRE
+from src.api.etag import ETagMiddleware
+from src.db.database import get_db, init_db_once, async_engine
+from src.db.models import JWSTObservation, OBSERVATION_COLUMNS, OBSERVATION_JSON, observation_to_dict, utc_now
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the schema, response cache and optional extensions before serving requests"""
+    await run_in_threadpool(init_db_once)
+    init_cache()
+    async with async_engine.connect() as conn:
+        app.state.has_earthdistance = bool(await conn.scalar(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'earthdistance'")
+        ))
+        app.state.has_system_rows = bool(await conn.scalar(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'tsm_system_rows'")
+        ))
+    yield
 
-# Initialize database on startup
-init_db()
 
 app = FastAPI(
     title="JWST API",
     description="REST API for accessing James Webb Space Telescope observation data (images & spectra)",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Enable CORS
@@ -30,6 +54,108 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Conditional GETs: ETag + Cache-Control, 304 when the client copy is current
+app.add_middleware(ETagMiddleware)
+
+
+# List pages: each row's JSON is built in Postgres, plus the sort key for the cursor
+PAGE_COLUMNS = (
+    OBSERVATION_JSON.label('doc'),
+    JWSTObservation.id,
+    JWSTObservation.observation_date
+)
+
+# Newest first; matches idx_obs_date_desc so keyset pages are index range scans
+DATE_ORDER = (
+    JWSTObservation.observation_date.desc().nullslast(),
+    JWSTObservation.id.desc()
+)
+
+
+def encode_cursor(obs) -> str:
+    """Encode an observation's (observation_date, id) sort key as an opaque cursor"""
+    date = obs.observation_date.isoformat() if obs.observation_date else ""
+    return base64.urlsafe_b64encode(f"{date}|{obs.id}".encode()).decode()
+
+
+def decode_cursor(after: str):
+    """Decode a cursor produced by encode_cursor back into (observation_date, id)"""
+    try:
+        date, obs_id = base64.urlsafe_b64decode(after.encode()).decode().rsplit("|", 1)
+        return (datetime.fromisoformat(date) if date else None), int(obs_id)
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def count_rows(db: AsyncSession, query) -> int:
+    """Count the rows a select would return"""
+    return await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+
+
+async def paginate(
+    db: AsyncSession,
+    query,
+    skip: int,
+    limit: int,
+    after: Optional[str] = None,
+    include_total: bool = False
+):
+    """
+    Return one page of observations newest-first, the cursor for the next page,
+    and the number of matches.
+    Seeks past the cursor when one is given, otherwise falls back to OFFSET.
+    Offset pages read the total from COUNT(*) OVER () in the same scan; cursor
+    pages only count (over the unseeked filter) when include_total is set.
+    """
+    base = query
+    total = None
+    
+    if after:
+        if include_total:
+            total = await count_rows(db, base)
+        cur_date, cur_id = decode_cursor(after)
+        observations = []
+        if cur_date is not None:
+            # The bare row comparison is an index range bound; undated rows
+            # never match it and are read separately below
+            dated = query.filter(
+                tuple_(JWSTObservation.observation_date, JWSTObservation.id) < tuple_(cur_date, cur_id)
+            ).order_by(*DATE_ORDER).limit(limit)
+            observations = (await db.execute(dated)).all()
+        
+        # Undated observations sort last; top up a short page from their tail
+        if len(observations) < limit:
+            tail = query.filter(JWSTObservation.observation_date.is_(None))
+            if cur_date is None:
+                tail = tail.filter(JWSTObservation.id < cur_id)
+            tail = tail.order_by(JWSTObservation.id.desc()).limit(limit - len(observations))
+            observations += (await db.execute(tail)).all()
+    else:
+        query = query.add_columns(func.count().over().label('total_count'))
+        query = query.order_by(*DATE_ORDER).offset(skip).limit(limit)
+        observations = (await db.execute(query)).all()
+        
+        if observations:
+            total = observations[0].total_count
+        else:
+            # Past the last page the window has no rows to report on
+            total = await count_rows(db, base) if skip else 0
+    
+    next_cursor = encode_cursor(observations[-1]) if len(observations) == limit else None
+    return observations, next_cursor, total
+
+
+def page_response(envelope: dict, observations) -> Response:
+    """
+    Render a list response, splicing the Postgres-built JSON of each row in as
+    the trailing "results" array so no per-row dicts are built in Python.
+    """
+    results = b"[" + ",".join(obs.doc for obs in observations).encode() + b"]"
+    return Response(
+        content=orjson.dumps(envelope)[:-1] + b',"results":' + results + b"}",
+        media_type="application/json"
+    )
+
 
 @app.get("/")
 async def root():
@@ -63,14 +189,16 @@ async def root():
 async def get_observations(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    after: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    include_total: bool = Query(False, description="Also count matches when paging by cursor"),
     instrument: Optional[str] = None,
     target: Optional[str] = None,
     filter: Optional[str] = None,
     proposal_id: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get list of observations with optional filtering"""
-    query = db.query(JWSTObservation)
+    query = select(*PAGE_COLUMNS)
     
     if instrument:
         query = query.filter(JWSTObservation.instrument.ilike(f"%{instrument}%"))
@@ -84,38 +212,39 @@ async def get_observations(
     if proposal_id:
         query = query.filter(JWSTObservation.proposal_id == proposal_id)
     
-    total = query.count()
-    observations = query.order_by(desc(JWSTObservation.observation_date)).offset(skip).limit(limit).all()
+    observations, next_cursor, total = await paginate(db, query, skip, limit, after, include_total)
     
-    return {
+    return page_response({
         "total": total,
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
         "filters_applied": {
             "instrument": instrument,
             "target": target,
             "filter": filter,
             "proposal_id": proposal_id
-        },
-        "results": [obs.to_dict() for obs in observations]
-    }
+        }
+    }, observations)
 
 
 @app.get("/observations/images")
 async def get_images(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    after: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    include_total: bool = Query(False, description="Also count matches when paging by cursor"),
     instrument: Optional[str] = None,
     filter: Optional[str] = None,
     target: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get imaging observations only (excludes spectra).
     
     Example: /observations/images?instrument=NIRCAM&filter=F200W
     """
-    query = db.query(JWSTObservation).filter(
+    query = select(*PAGE_COLUMNS).filter(
         JWSTObservation.dataproduct_type == "image"
     )
     
@@ -128,32 +257,33 @@ async def get_images(
     if target:
         query = query.filter(JWSTObservation.target_name.ilike(f"%{target}%"))
     
-    total = query.count()
-    observations = query.order_by(desc(JWSTObservation.observation_date)).offset(skip).limit(limit).all()
+    observations, next_cursor, total = await paginate(db, query, skip, limit, after, include_total)
     
-    return {
+    return page_response({
         "total": total,
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
         "filters_applied": {
             "instrument": instrument,
             "filter": filter,
             "target": target
-        },
-        "results": [obs.to_dict() for obs in observations]
-    }
+        }
+    }, observations)
 
 
 @app.get("/observations/spectra")
 async def get_spectra(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    after: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    include_total: bool = Query(False, description="Also count matches when paging by cursor"),
     instrument: Optional[str] = None,
     grating: Optional[str] = None,
     min_resolution: Optional[float] = None,
     min_wavelength: Optional[float] = Query(None, description="Minimum wavelength in microns"),
     max_wavelength: Optional[float] = Query(None, description="Maximum wavelength in microns"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get spectroscopic observations with spectrum-specific filters.
@@ -163,7 +293,7 @@ async def get_spectra(
     - /observations/spectra?grating=G395H&min_resolution=1000
     - /observations/spectra?min_wavelength=2.0&max_wavelength=5.0
     """
-    query = db.query(JWSTObservation).filter(
+    query = select(*PAGE_COLUMNS).filter(
         JWSTObservation.dataproduct_type == "spectrum"
     )
     
@@ -182,13 +312,13 @@ async def get_spectra(
     if max_wavelength:
         query = query.filter(JWSTObservation.wavelength_max <= max_wavelength)
     
-    total = query.count()
-    observations = query.order_by(desc(JWSTObservation.observation_date)).offset(skip).limit(limit).all()
+    observations, next_cursor, total = await paginate(db, query, skip, limit, after, include_total)
     
-    return {
+    return page_response({
         "total": total,
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
         "filters_applied": {
             "instrument": instrument,
             "grating": grating,
@@ -197,40 +327,59 @@ async def get_spectra(
                 "min": min_wavelength,
                 "max": max_wavelength
             } if min_wavelength or max_wavelength else None
-        },
-        "results": [obs.to_dict() for obs in observations]
-    }
+        }
+    }, observations)
 
 
 # IMPORTANT: /latest and /random MUST come BEFORE /{obs_id}
 @app.get("/observations/latest")
 async def get_latest_observations(
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    after: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get the most recent observations"""
-    observations = db.query(JWSTObservation).order_by(
-        desc(JWSTObservation.observation_date)
-    ).limit(limit).all()
+    if after:
+        observations, next_cursor, _ = await paginate(db, select(*PAGE_COLUMNS), 0, limit, after)
+    else:
+        # First page is the hot path; lambda_stmt reuses its compiled SQL across calls
+        observations = (await db.execute(lambda_stmt(
+            lambda: select(*PAGE_COLUMNS).order_by(*DATE_ORDER).limit(limit)
+        ))).all()
+        next_cursor = encode_cursor(observations[-1]) if len(observations) == limit else None
     
-    return {
+    return page_response({
         "total": len(observations),
-        "results": [obs.to_dict() for obs in observations]
-    }
+        "next_cursor": next_cursor
+    }, observations)
+
+
+RANDOM_OBSERVATION_SQL = text("SELECT * FROM observations TABLESAMPLE SYSTEM_ROWS(1)")
+
+# Fallback without tsm_system_rows: seek the primary key from a random id in
+# [min(id), max(id)]; ids after gaps are slightly favoured
+RANDOM_OBSERVATION_BY_ID_SQL = text("""
+    SELECT * FROM observations
+    WHERE id >= (SELECT min(id) + floor(random() * (max(id) - min(id) + 1))::int FROM observations)
+    ORDER BY id
+    LIMIT 1
+""")
 
 
 @app.get("/observations/random")
-async def get_random_observation(db: Session = Depends(get_db)):
+async def get_random_observation(request: Request, db: AsyncSession = Depends(get_db)):
     """Get a random observation"""
-    count = db.query(func.count(JWSTObservation.id)).scalar()
+    # Both queries read a single row instead of counting and walking an OFFSET;
+    # they only come back empty when the table itself is empty
+    if request.app.state.has_system_rows:
+        observation = (await db.execute(RANDOM_OBSERVATION_SQL)).first()
+    else:
+        observation = (await db.execute(RANDOM_OBSERVATION_BY_ID_SQL)).first()
     
-    if count == 0:
+    if not observation:
         raise HTTPException(status_code=404, detail="No observations found in database")
     
-    random_offset = random.randint(0, count - 1)
-    observation = db.query(JWSTObservation).offset(random_offset).first()
-    
-    return observation.to_dict()
+    return observation_to_dict(observation)
 
 
 @app.get("/observations/search")
@@ -243,13 +392,15 @@ async def search_observations(
     calib_level: Optional[int] = Query(None, ge=1, le=3, description="Calibration level (1-3)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    after: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    include_total: bool = Query(False, description="Also count matches when paging by cursor"),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Advanced search with multiple filters.
     Searches across target names, descriptions, and applies various filters.
     """
-    query = db.query(JWSTObservation)
+    query = select(*PAGE_COLUMNS)
     
     # Text search across target name and description
     if q:
@@ -276,13 +427,13 @@ async def search_observations(
     if calib_level:
         query = query.filter(JWSTObservation.calib_level == calib_level)
     
-    total = query.count()
-    observations = query.order_by(desc(JWSTObservation.observation_date)).offset(skip).limit(limit).all()
+    observations, next_cursor, total = await paginate(db, query, skip, limit, after, include_total)
     
-    return {
+    return page_response({
         "total": total,
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
         "query": q,
         "filters_applied": {
             "instrument": instrument,
@@ -290,47 +441,94 @@ async def search_observations(
             "proposal_id": proposal_id,
             "target_classification": target_classification,
             "calib_level": calib_level
-        },
-        "results": [obs.to_dict() for obs in observations]
-    }
+        }
+    }, observations)
+
+
+async def cone_search_indexed(db: AsyncSession, ra: float, dec: float, radius: float, limit: int):
+    """Great-circle cone search in Postgres, bounded by the GiST index on ll_to_earth(dec, ra)"""
+    # Declination maps to latitude and RA to longitude on the unit sphere
+    center = func.ll_to_earth(dec, ra)
+    position = func.ll_to_earth(JWSTObservation.dec, JWSTObservation.ra)
+    distance = func.earth_distance(center, position)
+    radius_m = math.radians(radius) * func.earth()
+    
+    rows = (await db.execute(select(
+        *OBSERVATION_COLUMNS,
+        func.degrees(distance / func.earth()).label('angular_distance'),
+        func.count().over().label('total_found')
+    ).filter(
+        JWSTObservation.ra.isnot(None),
+        JWSTObservation.dec.isnot(None),
+        func.earth_box(center, radius_m).op('@>')(position),
+        distance <= radius_m
+    ).order_by(distance).limit(limit))).all()
+    
+    return [(row, row.angular_distance) for row in rows], (rows[0].total_found if rows else 0)
+
+
+async def cone_search_numpy(db: AsyncSession, ra: float, dec: float, radius: float, limit: int):
+    """
+    Fallback cone search for databases without earthdistance.
+    Scans only (id, ra, dec), computes small-angle distances vectorized in NumPy,
+    then loads full rows for the nearest matches alone.
+    """
+    coords = (await db.execute(select(
+        JWSTObservation.id, JWSTObservation.ra, JWSTObservation.dec
+    ).filter(
+        JWSTObservation.ra.isnot(None),
+        JWSTObservation.dec.isnot(None)
+    ))).all()
+    
+    if not coords:
+        return [], 0
+    
+    ids, ra_arr, dec_arr = (np.array(column) for column in zip(*coords))
+    distances = np.hypot((ra_arr - ra) * math.cos(math.radians(dec)), dec_arr - dec)
+    
+    inside = np.flatnonzero(distances <= radius)
+    total_found = len(inside)
+    if total_found > limit:
+        # Top-k without sorting every match
+        inside = inside[np.argpartition(distances[inside], limit)[:limit]]
+    inside = inside[np.argsort(distances[inside])]
+    
+    rows = (await db.execute(
+        select(*OBSERVATION_COLUMNS).filter(JWSTObservation.id.in_(ids[inside].tolist()))
+    )).all()
+    rows_by_id = {row.id: row for row in rows}
+    
+    return [(rows_by_id[obs_id], distances[i]) for obs_id, i in zip(ids[inside].tolist(), inside)], total_found
 
 
 @app.get("/observations/search/coordinates")
 async def search_by_coordinates(
+    request: Request,
     ra: float = Query(..., description="Right Ascension in degrees (0-360)"),
     dec: float = Query(..., description="Declination in degrees (-90 to 90)"),
     radius: float = Query(1.0, ge=0.001, le=10.0, description="Search radius in degrees"),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Cone search: Find observations near a specific sky coordinate.
-    Uses a simple Euclidean distance approximation for small angles.
+    Uses great-circle distance via the earthdistance extension so the
+    GiST index on ll_to_earth(dec, ra) bounds the scan
+    (see src/db/migrate_add_spatial_index.py); without the extension,
+    falls back to a vectorized small-angle approximation.
     
     Example: /observations/search/coordinates?ra=202.5&dec=47.3&radius=0.5
     """
-    # Get all observations (in production, you'd want spatial indexing)
-    all_obs = db.query(JWSTObservation).filter(
-        JWSTObservation.ra.isnot(None),
-        JWSTObservation.dec.isnot(None)
-    ).all()
+    if request.app.state.has_earthdistance:
+        nearest, total_found = await cone_search_indexed(db, ra, dec, radius, limit)
+    else:
+        nearest, total_found = await cone_search_numpy(db, ra, dec, radius, limit)
     
-    # Calculate angular distance for each observation
     matches = []
-    for obs in all_obs:
-        # Simple angular distance calculation (works for small angles)
-        # For production, use proper spherical geometry
-        delta_ra = (obs.ra - ra) * math.cos(math.radians(dec))
-        delta_dec = obs.dec - dec
-        distance = math.sqrt(delta_ra**2 + delta_dec**2)
-        
-        if distance <= radius:
-            obs_dict = obs.to_dict()
-            obs_dict['angular_distance'] = round(distance, 6)
-            matches.append(obs_dict)
-    
-    # Sort by distance
-    matches.sort(key=lambda x: x['angular_distance'])
+    for row, angular_distance in nearest:
+        obs_dict = observation_to_dict(row)
+        obs_dict['angular_distance'] = round(float(angular_distance), 6)
+        matches.append(obs_dict)
     
     return {
         "search_center": {
@@ -338,8 +536,8 @@ async def search_by_coordinates(
             "dec": dec
         },
         "radius_degrees": radius,
-        "total_found": len(matches),
-        "results": matches[:limit]
+        "total_found": total_found,
+        "results": matches
     }
 
 
@@ -350,7 +548,9 @@ async def search_by_date(
     days_ago: Optional[int] = Query(None, ge=1, description="Observations from last N days"),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    after: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    include_total: bool = Query(False, description="Also count matches when paging by cursor"),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Search observations by date range.
@@ -359,11 +559,11 @@ async def search_by_date(
     - /observations/search/date?start_date=2024-01-01&end_date=2024-12-31
     - /observations/search/date?days_ago=30
     """
-    query = db.query(JWSTObservation).filter(JWSTObservation.observation_date.isnot(None))
+    query = select(*PAGE_COLUMNS).filter(JWSTObservation.observation_date.isnot(None))
     
     # Use days_ago if provided, otherwise use date range
     if days_ago:
-        cutoff_date = datetime.utcnow() - timedelta(days=days_ago)
+        cutoff_date = utc_now() - timedelta(days=days_ago)
         query = query.filter(JWSTObservation.observation_date >= cutoff_date)
     else:
         if start_date:
@@ -380,44 +580,42 @@ async def search_by_date(
             except ValueError:
                 raise HTTPException(status_code=400, detail="Invalid end_date format. Use YYYY-MM-DD")
     
-    total = query.count()
-    observations = query.order_by(desc(JWSTObservation.observation_date)).offset(skip).limit(limit).all()
+    observations, next_cursor, total = await paginate(db, query, skip, limit, after, include_total)
     
-    return {
+    return page_response({
         "total": total,
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
         "date_range": {
             "start_date": start_date,
             "end_date": end_date,
             "days_ago": days_ago
-        },
-        "results": [obs.to_dict() for obs in observations]
-    }
+        }
+    }, observations)
 
 
 # IMPORTANT: This dynamic route MUST come AFTER all specific routes like /latest, /random, /search, etc.
 @app.get("/observations/{obs_id}")
-async def get_observation(obs_id: str, db: Session = Depends(get_db)):
+async def get_observation(obs_id: str, db: AsyncSession = Depends(get_db)):
     """Get a specific observation by ID"""
-    observation = db.query(JWSTObservation).filter(JWSTObservation.obs_id == obs_id).first()
+    observation = (await db.execute(lambda_stmt(
+        lambda: select(*OBSERVATION_COLUMNS).where(JWSTObservation.obs_id == obs_id)
+    ))).first()
     
     if not observation:
         raise HTTPException(status_code=404, detail="Observation not found")
     
-    return observation.to_dict()
+    return observation_to_dict(observation)
 
 
 @app.get("/instruments")
-async def get_instruments(db: Session = Depends(get_db)):
+@cache(expire=CACHE_EXPIRE, namespace="aggregates")
+async def get_instruments(db: AsyncSession = Depends(get_db)):
     """Get list of all instruments with observation counts"""
-    instruments = db.query(
-        JWSTObservation.instrument,
-        func.count(JWSTObservation.id).label('count')
-    ).filter(
-        JWSTObservation.instrument.isnot(None),
-        JWSTObservation.instrument != ''
-    ).group_by(JWSTObservation.instrument).all()
+    instruments = (await db.execute(text(
+        "SELECT name, observation_count FROM mv_instrument_stats"
+    ))).all()
     
     return {
         "total": len(instruments),
@@ -429,18 +627,16 @@ async def get_instruments(db: Session = Depends(get_db)):
 
 
 @app.get("/filters")
+@cache(expire=CACHE_EXPIRE, namespace="aggregates")
 async def get_filters(
     limit: int = Query(100, ge=1, le=500),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get list of all filters with observation counts"""
-    filters = db.query(
-        JWSTObservation.filter_name,
-        func.count(JWSTObservation.id).label('count')
-    ).filter(
-        JWSTObservation.filter_name.isnot(None),
-        JWSTObservation.filter_name != ''
-    ).group_by(JWSTObservation.filter_name).order_by(desc('count')).limit(limit).all()
+    filters = (await db.execute(text(
+        "SELECT name, observation_count FROM mv_filter_stats "
+        "ORDER BY observation_count DESC LIMIT :limit"
+    ), {"limit": limit})).all()
     
     return {
         "total": len(filters),
@@ -452,19 +648,20 @@ async def get_filters(
 
 
 @app.get("/gratings")
+@cache(expire=CACHE_EXPIRE, namespace="aggregates")
 async def get_gratings(
     limit: int = Query(100, ge=1, le=500),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get list of all gratings/dispersers used in spectroscopic observations"""
-    gratings = db.query(
+    gratings = (await db.execute(select(
         JWSTObservation.grating,
         func.count(JWSTObservation.id).label('count')
     ).filter(
         JWSTObservation.grating.isnot(None),
         JWSTObservation.grating != '',
         JWSTObservation.dataproduct_type == 'spectrum'
-    ).group_by(JWSTObservation.grating).order_by(desc('count')).limit(limit).all()
+    ).group_by(JWSTObservation.grating).order_by(desc('count')).limit(limit))).all()
     
     return {
         "total": len(gratings),
@@ -476,18 +673,16 @@ async def get_gratings(
 
 
 @app.get("/targets")
+@cache(expire=CACHE_EXPIRE, namespace="aggregates")
 async def get_targets(
     limit: int = Query(100, ge=1, le=500),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get list of observed targets with observation counts"""
-    targets = db.query(
-        JWSTObservation.target_name,
-        func.count(JWSTObservation.id).label('count')
-    ).filter(
-        JWSTObservation.target_name.isnot(None),
-        JWSTObservation.target_name != ''
-    ).group_by(JWSTObservation.target_name).order_by(desc('count')).limit(limit).all()
+    targets = (await db.execute(text(
+        "SELECT name, observation_count FROM mv_target_stats "
+        "ORDER BY observation_count DESC LIMIT :limit"
+    ), {"limit": limit})).all()
     
     return {
         "total": len(targets),
@@ -499,24 +694,16 @@ async def get_targets(
 
 
 @app.get("/proposals")
+@cache(expire=CACHE_EXPIRE, namespace="aggregates")
 async def get_proposals(
     limit: int = Query(100, ge=1, le=500),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get list of all proposals with observation counts and details"""
-    proposals = db.query(
-        JWSTObservation.proposal_id,
-        JWSTObservation.description,
-        JWSTObservation.pi_name,
-        func.count(JWSTObservation.id).label('count')
-    ).filter(
-        JWSTObservation.proposal_id.isnot(None),
-        JWSTObservation.proposal_id != ''
-    ).group_by(
-        JWSTObservation.proposal_id,
-        JWSTObservation.description,
-        JWSTObservation.pi_name
-    ).order_by(desc('count')).limit(limit).all()
+    proposals = (await db.execute(text(
+        "SELECT proposal_id, description, pi_name, observation_count FROM mv_proposal_stats "
+        "ORDER BY observation_count DESC LIMIT :limit"
+    ), {"limit": limit})).all()
     
     return {
         "total": len(proposals),
@@ -537,141 +724,169 @@ async def get_proposal_observations(
     proposal_id: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    after: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    include_total: bool = Query(False, description="Also count matches when paging by cursor"),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all observations for a specific proposal"""
-    query = db.query(JWSTObservation).filter(JWSTObservation.proposal_id == proposal_id)
-    
-    total = query.count()
+    query = select(
+        *PAGE_COLUMNS, JWSTObservation.description, JWSTObservation.pi_name
+    ).filter(JWSTObservation.proposal_id == proposal_id)
     
-    if total == 0:
-        raise HTTPException(status_code=404, detail="Proposal not found")
+    observations, next_cursor, total = await paginate(db, query, skip, limit, after, include_total)
     
-    observations = query.order_by(desc(JWSTObservation.observation_date)).offset(skip).limit(limit).all()
+    # An empty page may just be past the end; probe the index before calling it a 404
+    if not observations:
+        exists = await db.scalar(
+            select(1).where(JWSTObservation.proposal_id == proposal_id).limit(1)
+        )
+        if exists is None:
+            raise HTTPException(status_code=404, detail="Proposal not found")
     
     # Get proposal details from first observation
     first_obs = observations[0] if observations else None
     
-    return {
+    return page_response({
         "proposal_id": proposal_id,
         "description": first_obs.description if first_obs else None,
         "pi_name": first_obs.pi_name if first_obs else None,
         "total_observations": total,
         "skip": skip,
         "limit": limit,
-        "results": [obs.to_dict() for obs in observations]
-    }
+        "next_cursor": next_cursor
+    }, observations)
+
+
+# One round-trip: a single scan for the scalar aggregates, the lookup views for
+# the top lists, and everything folded into one JSON document
+STATISTICS_SQL = text("""
+    WITH agg AS (
+        SELECT COUNT(*) AS total,
+               MIN(observation_date) AS earliest,
+               MAX(observation_date) AS latest,
+               COALESCE(SUM(exposure_time), 0) AS exposure,
+               COUNT(DISTINCT target_name) AS unique_targets,
+               COUNT(DISTINCT proposal_id) AS unique_proposals
+        FROM observations
+    ),
+    products AS (
+        SELECT dataproduct_type AS name, COUNT(*) AS count
+        FROM observations
+        WHERE dataproduct_type IS NOT NULL
+        GROUP BY dataproduct_type
+    ),
+    instruments AS (
+        SELECT instrument AS name, COUNT(*) AS count
+        FROM observations
+        WHERE instrument IS NOT NULL
+        GROUP BY instrument
+    ),
+    gratings AS (
+        SELECT grating AS name, COUNT(*) AS count
+        FROM observations
+        WHERE grating IS NOT NULL AND grating <> '' AND dataproduct_type = 'spectrum'
+        GROUP BY grating
+        ORDER BY count DESC
+        LIMIT 10
+    ),
+    targets AS (
+        SELECT name, observation_count AS count FROM mv_target_stats
+        ORDER BY observation_count DESC LIMIT 10
+    ),
+    filters AS (
+        SELECT name, observation_count AS count FROM mv_filter_stats
+        ORDER BY observation_count DESC LIMIT 10
+    )
+    SELECT json_build_object(
+        'total', agg.total,
+        'exposure', agg.exposure,
+        'unique_targets', agg.unique_targets,
+        'unique_proposals', agg.unique_proposals,
+        'products', (SELECT COALESCE(json_agg(p), '[]') FROM products p),
+        'instruments', (SELECT COALESCE(json_agg(i), '[]') FROM instruments i),
+        'targets', (SELECT COALESCE(json_agg(t ORDER BY t.count DESC), '[]') FROM targets t),
+        'filters', (SELECT COALESCE(json_agg(f ORDER BY f.count DESC), '[]') FROM filters f),
+        'gratings', (SELECT COALESCE(json_agg(g ORDER BY g.count DESC), '[]') FROM gratings g)
+    ) AS stats,
+    -- Returned as timestamps: json_build_object would trim trailing fractional zeros
+    agg.earliest,
+    agg.latest
+    FROM agg
+""")
 
 
 @app.get("/statistics")
-async def get_statistics(db: Session = Depends(get_db)):
+@cache(expire=CACHE_EXPIRE, namespace="aggregates")
+async def get_statistics(db: AsyncSession = Depends(get_db)):
     """Get comprehensive statistics about the JWST observations database"""
+    row = (await db.execute(STATISTICS_SQL)).one()
+    stats = row.stats
     
-    total_observations = db.query(func.count(JWSTObservation.id)).scalar()
-    
-    # Get date range
-    date_range = db.query(
-        func.min(JWSTObservation.observation_date),
-        func.max(JWSTObservation.observation_date)
-    ).first()
-    
-    # Get instrument counts
-    instrument_stats = db.query(
-        JWSTObservation.instrument,
-        func.count(JWSTObservation.id).label('count')
-    ).filter(
-        JWSTObservation.instrument.isnot(None)
-    ).group_by(JWSTObservation.instrument).all()
-    
-    # Get data product type breakdown (images vs spectra)
-    dataproduct_stats = db.query(
-        JWSTObservation.dataproduct_type,
-        func.count(JWSTObservation.id).label('count')
-    ).filter(
-        JWSTObservation.dataproduct_type.isnot(None)
-    ).group_by(JWSTObservation.dataproduct_type).all()
-    
-    # Get most observed targets
-    top_targets = db.query(
-        JWSTObservation.target_name,
-        func.count(JWSTObservation.id).label('count')
-    ).filter(
-        JWSTObservation.target_name.isnot(None),
-        JWSTObservation.target_name != ''
-    ).group_by(JWSTObservation.target_name).order_by(desc('count')).limit(10).all()
-    
-    # Get most used filters
-    top_filters = db.query(
-        JWSTObservation.filter_name,
-        func.count(JWSTObservation.id).label('count')
-    ).filter(
-        JWSTObservation.filter_name.isnot(None),
-        JWSTObservation.filter_name != ''
-    ).group_by(JWSTObservation.filter_name).order_by(desc('count')).limit(10).all()
-    
-    # Get top gratings for spectra
-    top_gratings = db.query(
-        JWSTObservation.grating,
-        func.count(JWSTObservation.id).label('count')
-    ).filter(
-        JWSTObservation.grating.isnot(None),
-        JWSTObservation.grating != '',
-        JWSTObservation.dataproduct_type == 'spectrum'
-    ).group_by(JWSTObservation.grating).order_by(desc('count')).limit(10).all()
-    
-    # Get total exposure time
-    total_exposure = db.query(func.sum(JWSTObservation.exposure_time)).scalar() or 0
-    
-    # Get unique counts
-    unique_targets = db.query(func.count(func.distinct(JWSTObservation.target_name))).scalar()
-    unique_proposals = db.query(func.count(func.distinct(JWSTObservation.proposal_id))).scalar()
+    total_observations = stats["total"]
+    total_exposure = stats["exposure"]
     
     return {
         "overview": {
             "total_observations": total_observations,
-            "unique_targets": unique_targets,
-            "unique_proposals": unique_proposals,
+            "unique_targets": stats["unique_targets"],
+            "unique_proposals": stats["unique_proposals"],
             "total_exposure_time_seconds": round(total_exposure, 2),
             "total_exposure_time_hours": round(total_exposure / 3600, 2),
             "date_range": {
-                "earliest": date_range[0].isoformat() if date_range[0] else None,
-                "latest": date_range[1].isoformat() if date_range[1] else None
+                "earliest": row.earliest.isoformat() if row.earliest else None,
+                "latest": row.latest.isoformat() if row.latest else None
             }
         },
         "data_products": {
             "breakdown": [
-                {"type": dp[0], "count": dp[1], "percentage": round(dp[1] / total_observations * 100, 1)}
-                for dp in dataproduct_stats
+                {"type": dp["name"], "count": dp["count"], "percentage": round(dp["count"] / total_observations * 100, 1)}
+                for dp in stats["products"]
             ]
         },
         "instruments": {
-            "total_instruments": len(instrument_stats),
+            "total_instruments": len(stats["instruments"]),
             "breakdown": [
-                {"name": inst[0], "count": inst[1], "percentage": round(inst[1] / total_observations * 100, 1)}
-                for inst in instrument_stats
+                {"name": inst["name"], "count": inst["count"], "percentage": round(inst["count"] / total_observations * 100, 1)}
+                for inst in stats["instruments"]
             ]
         },
         "top_targets": [
-            {"name": target[0], "observation_count": target[1]}
-            for target in top_targets
+            {"name": target["name"], "observation_count": target["count"]}
+            for target in stats["targets"]
         ],
         "top_filters": [
-            {"name": filt[0], "observation_count": filt[1]}
-            for filt in top_filters
+            {"name": filt["name"], "observation_count": filt["count"]}
+            for filt in stats["filters"]
         ],
         "top_gratings": [
-            {"name": grating[0], "observation_count": grating[1]}
-            for grating in top_gratings
-        ] if top_gratings else []
+            {"name": grating["name"], "observation_count": grating["count"]}
+            for grating in stats["gratings"]
+        ]
     }
 
 
 @app.get("/health")
-async def health_check(db: Session = Depends(get_db)):
-    """Health check endpoint with database status"""
+async def health_check(db: AsyncSession = Depends(get_db)):
+    """Liveness/readiness probe: a constant-time round-trip, no table access"""
+    try:
+        await db.execute(text("SELECT 1"))
+        return {
+            "status": "healthy",
+            "database": "connected"
+        }
+    except Exception as e:
+        return {
+            "status": "unhealthy",
+            "database": "disconnected",
+            "error": str(e)
+        }
+
+
+@app.get("/health/deep")
+async def deep_health_check(db: AsyncSession = Depends(get_db)):
+    """Health check that also counts observations (scans the table; not for frequent probes)"""
     try:
-        # Test database connection
-        count = db.query(func.count(JWSTObservation.id)).scalar()
+        count = await db.scalar(select(func.count(JWSTObservation.id)))
         return {
             "status": "healthy",
             "database": "connected",
@@ -15,3 +15,4 @@ def clean_env(value: str | None):
     return value
 
 DATABASE_URL = clean_env(os.getenv("DATABASE_URL"))
+REDIS_URL = clean_env(os.getenv("REDIS_URL"))
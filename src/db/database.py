@@ -1,6 +1,6 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
 # ⬅️ IMPORTANT: use config.py instead of raw os.getenv
 from src.config import DATABASE_URL
@@ -12,22 +12,60 @@ if not DATABASE_URL:
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-engine = create_engine(DATABASE_URL, echo=False)
+# Sync engine for the ingest jobs, migrations and init_db(); pooled connections
+# sit idle through long MAST requests, so they are pinged before reuse
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    query_cache_size=1200,
+    pool_size=5,
+    max_overflow=10,
+    pool_pre_ping=True
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
+# Async engine for the API so queries don't block the event loop
+ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=False,
+    query_cache_size=1200,
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30,
+    pool_pre_ping=True
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 
-def get_db() -> Session:
-    """Dependency for getting database sessions"""
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncSession:
+    """Dependency for getting async database sessions"""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 def init_db():
-    """Initialize database tables"""
+    """Initialize database tables and lookup views"""
     from src.db.models import Base
+    from src.db.lookup_views import create_lookup_views
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        create_lookup_views(conn)
+
+
+# Arbitrary app-wide key for the schema-init advisory lock ("JWST")
+INIT_LOCK_KEY = 0x4A575354
+
+
+def init_db_once():
+    """
+    Run init_db() under an advisory lock so workers starting together take turns.
+    A worker that loses the race blocks until the schema exists instead of
+    serving before it; its own pass then finds every table and view in place.
+    """
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": INIT_LOCK_KEY})
+        try:
+            init_db()
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": INIT_LOCK_KEY})
@@ -0,0 +1,76 @@
+"""
+Materialized views holding per-value observation counts for the
+discovery endpoints (/instruments, /filters, /targets, /proposals).
+
+Created by init_db() and refreshed by the ingest job after new rows land,
+so the API reads a handful of precomputed rows instead of re-aggregating
+the observations table on every request.
+"""
+
+from sqlalchemy import text
+
+
+def _count_view(view: str, column: str) -> str:
+    return f"""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS {view} AS
+        SELECT {column} AS name, COUNT(*) AS observation_count
+        FROM observations
+        WHERE {column} IS NOT NULL AND {column} <> ''
+        GROUP BY {column}
+    """
+
+
+LOOKUP_VIEWS = {
+    "mv_instrument_stats": [
+        _count_view("mv_instrument_stats", "instrument"),
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_instrument_stats_name ON mv_instrument_stats (name)",
+    ],
+    "mv_filter_stats": [
+        _count_view("mv_filter_stats", "filter_name"),
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_filter_stats_name ON mv_filter_stats (name)",
+    ],
+    "mv_target_stats": [
+        _count_view("mv_target_stats", "target_name"),
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_target_stats_name ON mv_target_stats (name)",
+    ],
+    "mv_proposal_stats": [
+        # Count per proposal_id alone, then take title/PI from any one of its rows;
+        # they're per-proposal attributes, so grouping on them only widens the sort
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS mv_proposal_stats AS
+        SELECT c.proposal_id, p.description, p.pi_name, c.observation_count
+        FROM (
+            SELECT proposal_id, COUNT(*) AS observation_count
+            FROM observations
+            WHERE proposal_id IS NOT NULL AND proposal_id <> ''
+            GROUP BY proposal_id
+        ) c
+        CROSS JOIN LATERAL (
+            SELECT description, pi_name
+            FROM observations o
+            WHERE o.proposal_id = c.proposal_id
+            LIMIT 1
+        ) p
+        """,
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_proposal_stats_id ON mv_proposal_stats (proposal_id)",
+    ],
+}
+
+
+def create_lookup_views(conn):
+    """Create the lookup views and the unique indexes CONCURRENTLY refresh needs"""
+    for statements in LOOKUP_VIEWS.values():
+        for sql in statements:
+            conn.execute(text(sql))
+
+
+def drop_lookup_views(conn):
+    """Drop the lookup views so create_lookup_views() rebuilds them from current definitions"""
+    for view in LOOKUP_VIEWS:
+        conn.execute(text(f"DROP MATERIALIZED VIEW IF EXISTS {view}"))
+
+
+def refresh_lookup_views(conn):
+    """Recompute the lookup views without blocking readers"""
+    for view in LOOKUP_VIEWS:
+        conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}"))
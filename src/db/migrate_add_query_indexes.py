@@ -0,0 +1,64 @@
+"""
+Migration script to add indexes backing the API's hot query paths
+Safe to re-run; every statement is IF NOT EXISTS
+
+Usage: python src/db/migrate_add_query_indexes.py
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.db.migrations import apply_ddl, create_indexes_concurrently
+
+def migrate():
+    """Add query indexes to observations table"""
+    
+    print("🔧 Adding query indexes to database...")
+    print("=" * 60)
+    
+    statements = [
+        # Trigram indexes let ILIKE '%term%' filters use an index scan
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        # Constant-time random row for /observations/random
+        "CREATE EXTENSION IF NOT EXISTS tsm_system_rows"
+    ]
+    indexes = [
+        # Keyset pagination: ORDER BY observation_date DESC NULLS LAST, id DESC
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_obs_date_desc ON observations (observation_date DESC NULLS LAST, id DESC)",
+        # Same order within one product type (/observations/images and /spectra)
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_obs_type_date_desc ON observations (dataproduct_type, observation_date DESC NULLS LAST, id DESC)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_obs_target_trgm ON observations USING gin (target_name gin_trgm_ops)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_obs_instrument_trgm ON observations USING gin (instrument gin_trgm_ops)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_obs_filter_trgm ON observations USING gin (filter_name gin_trgm_ops)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_obs_description_trgm ON observations USING gin (description gin_trgm_ops)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_obs_classification_trgm ON observations USING gin (target_classification gin_trgm_ops)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_obs_grating_trgm ON observations USING gin (grating gin_trgm_ops)",
+        # Index-only title/PI lookup when building mv_proposal_stats
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_obs_proposal ON observations (proposal_id) INCLUDE (description, pi_name)"
+    ]
+    
+    for sql in statements + indexes:
+        print(f"⏳ {sql[:50]}...")
+    
+    try:
+        apply_ddl(statements)
+    except Exception as e:
+        print(f"❌ Migration failed, nothing was applied: {e}")
+        raise
+    
+    # The extensions are committed now; each index build below commits on its own
+    try:
+        for name in create_indexes_concurrently(indexes):
+            print(f"🔁 Rebuilt invalid index {name}")
+    except Exception as e:
+        print(f"❌ Index build failed after the extensions were applied; rerun to finish: {e}")
+        raise
+    
+    print("=" * 60)
+    print("✅ Migration complete! Query indexes added.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,52 @@
+"""
+Migration script to enable server-side cone search on RA/Dec
+Installs the cube + earthdistance extensions and adds a GiST index
+on ll_to_earth(dec, ra) used by /observations/search/coordinates
+
+Usage: python src/db/migrate_add_spatial_index.py
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.db.migrations import apply_ddl, create_indexes_concurrently
+
+def migrate():
+    """Enable earthdistance and index observation coordinates"""
+    
+    print("🔧 Adding spatial index for cone search...")
+    print("=" * 60)
+    
+    statements = [
+        "CREATE EXTENSION IF NOT EXISTS cube",
+        "CREATE EXTENSION IF NOT EXISTS earthdistance"
+    ]
+    indexes = [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_obs_radec_gist ON observations USING gist (ll_to_earth(dec, ra))"
+    ]
+    
+    for sql in statements + indexes:
+        print(f"⏳ {sql[:50]}...")
+    
+    try:
+        apply_ddl(statements)
+    except Exception as e:
+        print(f"❌ Migration failed, nothing was applied: {e}")
+        raise
+    
+    # The extensions are committed now; each index build below commits on its own
+    try:
+        for name in create_indexes_concurrently(indexes):
+            print(f"🔁 Rebuilt invalid index {name}")
+    except Exception as e:
+        print(f"❌ Index build failed after the extensions were applied; rerun to finish: {e}")
+        raise
+    
+    print("=" * 60)
+    print("✅ Migration complete! Cone search now uses the spatial index.")
+
+if __name__ == "__main__":
+    migrate()
@@ -7,12 +7,11 @@ Usage: python src/db/migrate_add_spectrum_fields.py
 
 import sys
 import os
-from sqlalchemy import text
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from src.db.database import engine
+from src.db.migrations import apply_ddl, create_indexes_concurrently
 
 def migrate():
     """Add new spectrum fields to observations table"""
@@ -20,26 +19,35 @@ def migrate():
     print("🔧 Adding spectrum-specific fields to database...")
     print("=" * 60)
     
-    with engine.connect() as conn:
-        # Add new columns
-        columns_to_add = [
-            "ALTER TABLE observations ADD COLUMN IF NOT EXISTS spectral_resolution FLOAT",
-            "ALTER TABLE observations ADD COLUMN IF NOT EXISTS wavelength_min FLOAT",
-            "ALTER TABLE observations ADD COLUMN IF NOT EXISTS wavelength_max FLOAT",
-            "ALTER TABLE observations ADD COLUMN IF NOT EXISTS dispersion_axis INTEGER",
-            "ALTER TABLE observations ADD COLUMN IF NOT EXISTS grating VARCHAR",
-            "ALTER TABLE observations ADD COLUMN IF NOT EXISTS slit_width FLOAT",
-            "CREATE INDEX IF NOT EXISTS idx_observations_dataproduct_type ON observations(dataproduct_type)",
-            "CREATE INDEX IF NOT EXISTS idx_observations_grating ON observations(grating)"
-        ]
-        
-        for sql in columns_to_add:
-            try:
-                conn.execute(text(sql))
-                conn.commit()
-                print(f"✅ {sql[:50]}...")
-            except Exception as e:
-                print(f"⚠️  Could not execute: {e}")
+    columns_to_add = [
+        "ALTER TABLE observations ADD COLUMN IF NOT EXISTS spectral_resolution FLOAT",
+        "ALTER TABLE observations ADD COLUMN IF NOT EXISTS wavelength_min FLOAT",
+        "ALTER TABLE observations ADD COLUMN IF NOT EXISTS wavelength_max FLOAT",
+        "ALTER TABLE observations ADD COLUMN IF NOT EXISTS dispersion_axis INTEGER",
+        "ALTER TABLE observations ADD COLUMN IF NOT EXISTS grating VARCHAR",
+        "ALTER TABLE observations ADD COLUMN IF NOT EXISTS slit_width FLOAT"
+    ]
+    indexes = [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_observations_dataproduct_type ON observations(dataproduct_type)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_observations_grating ON observations(grating)"
+    ]
+    
+    for sql in columns_to_add + indexes:
+        print(f"⏳ {sql[:50]}...")
+    
+    try:
+        apply_ddl(columns_to_add)
+    except Exception as e:
+        print(f"❌ Migration failed, nothing was applied: {e}")
+        raise
+    
+    # The new columns are committed now; each index build below commits on its own
+    try:
+        for name in create_indexes_concurrently(indexes):
+            print(f"🔁 Rebuilt invalid index {name}")
+    except Exception as e:
+        print(f"❌ Index build failed after the new columns were applied; rerun to finish: {e}")
+        raise
     
     print("=" * 60)
     print("✅ Migration complete! Spectrum fields added.")
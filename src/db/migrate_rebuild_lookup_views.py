@@ -0,0 +1,39 @@
+"""
+Migration script to rebuild the materialized lookup views
+Run this after a view definition in src/db/lookup_views.py changes;
+CREATE ... IF NOT EXISTS in init_db() won't replace an existing view
+
+Usage: python src/db/migrate_rebuild_lookup_views.py
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.db.database import engine
+from src.db.lookup_views import LOOKUP_VIEWS, create_lookup_views, drop_lookup_views
+
+def migrate():
+    """Drop and recreate every lookup view in one transaction"""
+    
+    print("🔧 Rebuilding lookup views...")
+    print("=" * 60)
+    
+    for view in LOOKUP_VIEWS:
+        print(f"⏳ {view}")
+    
+    try:
+        with engine.begin() as conn:
+            drop_lookup_views(conn)
+            create_lookup_views(conn)
+    except Exception as e:
+        print(f"❌ Migration failed, nothing was applied: {e}")
+        raise
+    
+    print("=" * 60)
+    print("✅ Migration complete! Lookup views rebuilt.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,56 @@
+"""
+Helpers shared by the schema migration scripts
+"""
+
+import re
+
+from sqlalchemy import text
+
+from src.db.database import engine
+
+# Fail fast instead of queueing behind (and blocking) live API traffic
+LOCK_TIMEOUT = "2s"
+STATEMENT_TIMEOUT = "30min"
+
+
+def apply_ddl(statements):
+    """
+    Run DDL statements as a single transaction in one round-trip.
+    Either every statement applies or none do; keep them IF NOT EXISTS so reruns are safe.
+    """
+    sql = ";\n".join([
+        f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'",
+        f"SET LOCAL statement_timeout = '{STATEMENT_TIMEOUT}'",
+        *(statement.strip().rstrip(";") for statement in statements)
+    ])
+    with engine.begin() as conn:
+        conn.exec_driver_sql(sql)
+
+
+INVALID_INDEXES_SQL = text("""
+    SELECT c.relname
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE NOT i.indisvalid AND c.relname = ANY(:names)
+""")
+
+
+def create_indexes_concurrently(statements):
+    """
+    Build indexes with CREATE INDEX CONCURRENTLY so the API keeps reading and writing.
+    CONCURRENTLY can't run inside a transaction, so each statement autocommits.
+    An interrupted build leaves an invalid index that IF NOT EXISTS would skip,
+    so those are rebuilt with REINDEX CONCURRENTLY. Returns the rebuilt names.
+    """
+    names = [re.search(r"IF NOT EXISTS (\w+)", statement).group(1) for statement in statements]
+    
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql(f"SET statement_timeout = '{STATEMENT_TIMEOUT}'")
+        for statement in statements:
+            conn.exec_driver_sql(statement)
+        
+        invalid = conn.execute(INVALID_INDEXES_SQL, {"names": names}).scalars().all()
+        for name in invalid:
+            conn.exec_driver_sql(f"REINDEX INDEX CONCURRENTLY {name}")
+    
+    return invalid
@@ -1,90 +1,204 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text
-from sqlalchemy.ext.declarative import declarative_base
-from datetime import datetime
+from sqlalchemy import Integer, String, DateTime, Float, Text, Index, case, cast, func, literal, literal_column
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from datetime import datetime, timezone
+from operator import attrgetter
 
-Base = declarative_base()
+
+def utc_now() -> datetime:
+    """Current UTC time as a naive datetime, matching the tz-less DateTime columns"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class Base(DeclarativeBase):
+    pass
 
 
 class JWSTObservation(Base):
     """Model for storing JWST observation metadata (images and spectra)"""
     __tablename__ = 'observations'
     
-    id = Column(Integer, primary_key=True, index=True)
-    obs_id = Column(String, unique=True, index=True, nullable=False)
-    target_name = Column(String, index=True)
-    ra = Column(Float)  # Right Ascension
-    dec = Column(Float)  # Declination
-    instrument = Column(String, index=True)
-    filter_name = Column(String, index=True)
-    observation_date = Column(DateTime, index=True)
-    preview_url = Column(Text)
-    fits_url = Column(Text)
-    description = Column(Text)
-    proposal_id = Column(String, index=True)
-    exposure_time = Column(Float)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    obs_id: Mapped[str] = mapped_column(String, unique=True, index=True)
+    target_name: Mapped[str | None] = mapped_column(String, index=True)
+    ra: Mapped[float | None] = mapped_column(Float)  # Right Ascension
+    dec: Mapped[float | None] = mapped_column(Float)  # Declination
+    instrument: Mapped[str | None] = mapped_column(String, index=True)
+    filter_name: Mapped[str | None] = mapped_column(String, index=True)
+    observation_date: Mapped[datetime | None] = mapped_column(DateTime, index=True)
+    preview_url: Mapped[str | None] = mapped_column(Text)
+    fits_url: Mapped[str | None] = mapped_column(Text)
+    description: Mapped[str | None] = mapped_column(Text)
+    proposal_id: Mapped[str | None] = mapped_column(String, index=True)
+    exposure_time: Mapped[float | None] = mapped_column(Float)
     
     # General metadata fields
-    dataproduct_type = Column(String, index=True)  # image, spectrum, etc.
-    calib_level = Column(Integer)  # 1=raw, 2=calibrated, 3=science-ready
-    wavelength_region = Column(String)  # Infrared, optical, etc.
-    pi_name = Column(String)  # Principal Investigator
-    target_classification = Column(String)  # galaxy, star, exoplanet, etc.
+    dataproduct_type: Mapped[str | None] = mapped_column(String, index=True)  # image, spectrum, etc.
+    calib_level: Mapped[int | None] = mapped_column(Integer)  # 1=raw, 2=calibrated, 3=science-ready
+    wavelength_region: Mapped[str | None] = mapped_column(String)  # Infrared, optical, etc.
+    pi_name: Mapped[str | None] = mapped_column(String)  # Principal Investigator
+    target_classification: Mapped[str | None] = mapped_column(String)  # galaxy, star, exoplanet, etc.
     
     # Spectrum-specific metadata fields
-    spectral_resolution = Column(Float)  # R = λ/Δλ
-    wavelength_min = Column(Float)  # Minimum wavelength in microns
-    wavelength_max = Column(Float)  # Maximum wavelength in microns
-    dispersion_axis = Column(Integer)  # 1 or 2 for spectral dispersion direction
-    grating = Column(String)  # Grating/disperser used (e.g., G140M, G235H)
-    slit_width = Column(Float)  # Slit width in arcseconds
+    spectral_resolution: Mapped[float | None] = mapped_column(Float)  # R = λ/Δλ
+    wavelength_min: Mapped[float | None] = mapped_column(Float)  # Minimum wavelength in microns
+    wavelength_max: Mapped[float | None] = mapped_column(Float)  # Maximum wavelength in microns
+    dispersion_axis: Mapped[int | None] = mapped_column(Integer)  # 1 or 2 for spectral dispersion direction
+    grating: Mapped[str | None] = mapped_column(String)  # Grating/disperser used (e.g., G140M, G235H)
+    slit_width: Mapped[float | None] = mapped_column(Float)  # Slit width in arcseconds
+    
+    created_at: Mapped[datetime | None] = mapped_column(DateTime, default=utc_now)
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime, default=utc_now, onupdate=utc_now)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    __table_args__ = (
+        # Backs newest-first keyset pagination in the API list endpoints
+        Index('idx_obs_date_desc', observation_date.desc().nullslast(), id.desc()),
+        # Same order within one product type, for /observations/images and /spectra
+        Index('idx_obs_type_date_desc', dataproduct_type, observation_date.desc().nullslast(), id.desc()),
+    )
     
     def to_dict(self):
         """Convert model to dictionary with MAST URL conversion"""
-        # Helper to convert MAST URIs
-        def convert_url(uri):
-            if uri and uri.startswith("mast:"):
-                return f"https://mast.stsci.edu/api/v0.1/Download/file?uri={uri}"
-            return uri
-        
-        base_dict = {
-            'id': self.id,
-            'obs_id': self.obs_id,
-            'target_name': self.target_name,
-            'coordinates': {
-                'ra': self.ra,
-                'dec': self.dec
-            },
-            'instrument': self.instrument,
-            'filter': self.filter_name,
-            'observation_date': self.observation_date.isoformat() if self.observation_date else None,
-            'preview_url': convert_url(self.preview_url),
-            'fits_url': convert_url(self.fits_url),
-            'description': self.description,
-            'proposal_id': self.proposal_id,
-            'exposure_time': self.exposure_time,
-            'dataproduct_type': self.dataproduct_type,
-            'calib_level': self.calib_level,
-            'wavelength_region': self.wavelength_region,
-            'pi_name': self.pi_name,
-            'target_classification': self.target_classification,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+        return observation_to_dict(self)
+
+
+# Columns serialized by observation_to_dict; selecting these directly skips ORM hydration
+OBSERVATION_COLUMNS = tuple(
+    column for column in JWSTObservation.__table__.columns if column.name != 'updated_at'
+)
+
+
+# Public download endpoint that mast: URIs are appended to
+MAST_DOWNLOAD_URL = "https://mast.stsci.edu/api/v0.1/Download/file?uri="
+
+
+def convert_url(uri):
+    """Convert a mast: URI into a public download URL"""
+    if uri and uri.startswith("mast:"):
+        return MAST_DOWNLOAD_URL + uri
+    return uri
+
+
+# Response keys in output order, and the attributes they are read from in one
+# C-level call; 'coordinates' and the URLs are placeholders rewritten in place
+_DICT_KEYS = (
+    'id', 'obs_id', 'target_name', 'coordinates', 'instrument', 'filter',
+    'observation_date', 'preview_url', 'fits_url', 'description', 'proposal_id',
+    'exposure_time', 'dataproduct_type', 'calib_level', 'wavelength_region',
+    'pi_name', 'target_classification', 'created_at'
+)
+_read_dict_fields = attrgetter(
+    'id', 'obs_id', 'target_name', 'ra', 'instrument', 'filter_name',
+    'observation_date', 'preview_url', 'fits_url', 'description', 'proposal_id',
+    'exposure_time', 'dataproduct_type', 'calib_level', 'wavelength_region',
+    'pi_name', 'target_classification', 'created_at'
+)
+
+
+def observation_to_dict(obs):
+    """
+    Convert an observation to a response dictionary.
+    Accepts a JWSTObservation or a row selected with OBSERVATION_COLUMNS.
+    Datetimes are left as-is for the JSON encoder to render as ISO 8601.
+    """
+    base_dict = dict(zip(_DICT_KEYS, _read_dict_fields(obs)))
+    base_dict['coordinates'] = {
+        'ra': obs.ra,
+        'dec': obs.dec
+    }
+    base_dict['preview_url'] = convert_url(base_dict['preview_url'])
+    base_dict['fits_url'] = convert_url(base_dict['fits_url'])
+    
+    # Add spectrum-specific fields if this is a spectrum
+    if obs.dataproduct_type == 'spectrum':
+        base_dict['spectrum_metadata'] = {
+            'spectral_resolution': obs.spectral_resolution,
+            'wavelength_range': {
+                'min': obs.wavelength_min,
+                'max': obs.wavelength_max,
+                'unit': 'microns'
+            } if obs.wavelength_min or obs.wavelength_max else None,
+            'dispersion_axis': obs.dispersion_axis,
+            'grating': obs.grating,
+            'slit_width': obs.slit_width
         }
-        
-        # Add spectrum-specific fields if this is a spectrum
-        if self.dataproduct_type == 'spectrum':
-            base_dict['spectrum_metadata'] = {
-                'spectral_resolution': self.spectral_resolution,
-                'wavelength_range': {
-                    'min': self.wavelength_min,
-                    'max': self.wavelength_max,
-                    'unit': 'microns'
-                } if self.wavelength_min or self.wavelength_max else None,
-                'dispersion_axis': self.dispersion_axis,
-                'grating': self.grating,
-                'slit_width': self.slit_width
-            }
-        
-        return base_dict  
+    
+    return base_dict  
+
+
+# --- SQL twin of observation_to_dict, for building response JSON in Postgres ---
+
+def _mast_url_sql(column):
+    """convert_url() as a SQL expression"""
+    return case(
+        (column.like('mast:%'), literal(MAST_DOWNLOAD_URL) + column),
+        else_=column
+    )
+
+
+_ISO_SECONDS = literal_column("""'YYYY-MM-DD"T"HH24:MI:SS'""")
+_ISO_MICROSECONDS = literal_column("""'YYYY-MM-DD"T"HH24:MI:SS.US'""")
+
+
+def _iso_datetime_sql(column):
+    """A timestamp rendered as orjson renders a naive datetime: six-digit microseconds, omitted when zero"""
+    return case(
+        (func.date_trunc('second', column) == column, func.to_char(column, _ISO_SECONDS)),
+        else_=func.to_char(column, _ISO_MICROSECONDS)
+    )
+
+
+def _json_object(*fields):
+    """json_build_object() over (key, expression) pairs; keys are inlined so the SQL caches"""
+    return func.json_build_object(*(
+        part for key, value in fields for part in (literal_column(f"'{key}'"), value)
+    ))
+
+
+_obs = JWSTObservation
+
+_OBSERVATION_JSON_FIELDS = (
+    ('id', _obs.id),
+    ('obs_id', _obs.obs_id),
+    ('target_name', _obs.target_name),
+    ('coordinates', _json_object(('ra', _obs.ra), ('dec', _obs.dec))),
+    ('instrument', _obs.instrument),
+    ('filter', _obs.filter_name),
+    ('observation_date', _iso_datetime_sql(_obs.observation_date)),
+    ('preview_url', _mast_url_sql(_obs.preview_url)),
+    ('fits_url', _mast_url_sql(_obs.fits_url)),
+    ('description', _obs.description),
+    ('proposal_id', _obs.proposal_id),
+    ('exposure_time', _obs.exposure_time),
+    ('dataproduct_type', _obs.dataproduct_type),
+    ('calib_level', _obs.calib_level),
+    ('wavelength_region', _obs.wavelength_region),
+    ('pi_name', _obs.pi_name),
+    ('target_classification', _obs.target_classification),
+    ('created_at', _iso_datetime_sql(_obs.created_at)),
+)
+
+_SPECTRUM_METADATA_JSON = _json_object(
+    ('spectral_resolution', _obs.spectral_resolution),
+    ('wavelength_range', case(
+        (
+            (func.coalesce(_obs.wavelength_min, 0) != 0) | (func.coalesce(_obs.wavelength_max, 0) != 0),
+            _json_object(
+                ('min', _obs.wavelength_min),
+                ('max', _obs.wavelength_max),
+                ('unit', literal_column("'microns'"))
+            )
+        )
+    )),
+    ('dispersion_axis', _obs.dispersion_axis),
+    ('grating', _obs.grating),
+    ('slit_width', _obs.slit_width),
+)
+
+# One observation rendered as JSON text by Postgres, matching observation_to_dict
+OBSERVATION_JSON = cast(case(
+    (
+        _obs.dataproduct_type == literal_column("'spectrum'"),
+        _json_object(*_OBSERVATION_JSON_FIELDS, ('spectrum_metadata', _SPECTRUM_METADATA_JSON))
+    ),
+    else_=_json_object(*_OBSERVATION_JSON_FIELDS)
+), Text)
@@ -1,11 +1,16 @@
-from src.db.database import Base, engine
+from src.db.database import engine, init_db
+from src.db.lookup_views import drop_lookup_views
+from src.db.models import Base
 
 def reset_db():
     print("Dropping all tables...")
+    # The lookup views depend on observations, so they go first
+    with engine.begin() as conn:
+        drop_lookup_views(conn)
     Base.metadata.drop_all(bind=engine)
 
     print("Creating all tables...")
-    Base.metadata.create_all(bind=engine)
+    init_db()
 
     print("Database reset complete.")
 
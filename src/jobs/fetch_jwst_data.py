@@ -2,31 +2,88 @@
 JWST Data Fetcher with Smart Monthly Batch Processing
 Supports both IMAGE and SPECTRUM data with appropriate metadata.
 
-Usage: python src/jobs/fetch_jwst_data.py
+Usage: python src/jobs/fetch_jwst_data.py [--months N]
 """
 
 import sys
 import os
-import json
+import argparse
+import random
+import re
+import time
 import traceback
-from datetime import datetime, UTC
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, UTC
+from functools import lru_cache
 from pathlib import Path
 
-from astroquery.mast import Observations
-from astropy.time import Time
+from astropy.table import Table, unique, vstack
+from astroquery.exceptions import RemoteServiceError
+from astroquery.mast import Mast, Observations
+import orjson
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from src.db.database import SessionLocal, init_db
-from src.db.models import JWSTObservation
+from src.api.cache import clear_response_cache
+from src.db.database import SessionLocal, engine, init_db
+from src.db.lookup_views import refresh_lookup_views
+from src.db.models import JWSTObservation, MAST_DOWNLOAD_URL, utc_now
 
 
 # Configuration
 MAX_RESULTS = 50
+PRODUCT_WORKERS = 8  # concurrent get_product_list requests to MAST
+PRODUCT_BATCH_SIZE = 50  # observations per get_product_list request
+PRODUCT_ATTEMPTS = 3  # tries per product request on transient MAST errors
+RETRY_MAX_DELAY = 30  # seconds, cap on the exponential backoff between tries
+MONTH_WORKERS = 4  # months fetched concurrently with --months
+QUERY_SLICES = 4  # concurrent query_criteria requests per month, one per slice of its t_min range
 PROGRESS_FILE = "progress.json"
 
+# Modified Julian Date zero point (UTC)
+MJD_EPOCH = datetime(1858, 11, 17)
+
+# Observation table columns read while building rows
+OBSERVATION_FIELDS = (
+    "obsid", "obs_id", "target_name", "s_ra", "s_dec", "instrument_name", "filters",
+    "t_min", "proposal_id", "t_exptime", "obs_title", "dataproduct_type", "calib_level",
+    "wavelength_region", "proposal_pi", "target_classification",
+    "em_res_power", "em_min", "em_max",
+)
+
+# Ask MAST for just those columns rather than query_criteria's "*"
+QUERY_COLUMNS = ",".join(OBSERVATION_FIELDS)
+
+# Insert new observations; rows that appeared since the existence check are overwritten
+_insert = insert(JWSTObservation)
+UPSERT_OBSERVATIONS = _insert.on_conflict_do_update(
+    index_elements=[JWSTObservation.obs_id],
+    set_={
+        column.name: _insert.excluded[column.name]
+        for column in JWSTObservation.__table__.columns
+        if column.name not in ("id", "obs_id", "created_at")
+    }
+)
+
+# Bare product filenames that map to a MAST download URL
+PRODUCT_FILE_EXTENSIONS = (".fits", ".jpg", ".jpeg", ".png")
+FITS_EXTENSION = ".fits"
+
+# JWST gratings/dispersers named in the filters field of spectra (PRISM, G140M, G395H, ...)
+GRATING_PATTERN = re.compile(r"PRISM|G140|G235|G395|G150", re.IGNORECASE)
+
+# Errors worth retrying; anything else fails the month straight away
+TRANSIENT_MAST_ERRORS = (RequestsConnectionError, Timeout, RemoteServiceError)
+
+# Product table columns read by extract_urls
+PRODUCT_FIELDS = ("jpegURL", "pngURL", "dataURI", "dataURL", "dataproduct_type", "productFilename")
+
 
 # -------------------------------------------------------
 # PROGRESS TRACKING
@@ -38,45 +95,51 @@ def load_progress():
         return {"completed_months": [], "total_observations": 0}
     
     try:
-        with open(PROGRESS_FILE, 'r') as f:
-            return json.load(f)
-    except:
+        with open(PROGRESS_FILE, 'rb') as f:
+            return orjson.loads(f.read())
+    except (OSError, ValueError):
         return {"completed_months": [], "total_observations": 0}
 
 
 def save_progress(progress):
-    """Save progress to JSON file"""
-    with open(PROGRESS_FILE, 'w') as f:
-        json.dump(progress, indent=2, fp=f)
+    """Save progress to JSON file, replacing it atomically so a crash never leaves it torn"""
+    tmp_file = PROGRESS_FILE + ".tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(orjson.dumps(progress, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_file, PROGRESS_FILE)
 
 
+@lru_cache(maxsize=1)
 def get_all_months():
-    """Generate list of all months from Jan 2022 to current month"""
-    months = []
-    start_year = 2022
+    """Generate all months from Jan 2022 to current month (computed once per run)"""
     current = datetime.now()
-    
-    for year in range(start_year, current.year + 1):
-        for month in range(1, 13):
-            # Stop at current month
-            if year == current.year and month > current.month:
-                break
-            months.append(f"{year}-{month:02d}")
-    
-    return months
+    return tuple(
+        f"{year}-{month:02d}"
+        for year in range(2022, current.year + 1)
+        for month in range(1, (current.month if year == current.year else 12) + 1)
+    )
+
+
+def get_months_to_process(progress, count):
+    """Determine the next `count` months that haven't been fetched, most recent first"""
+    completed = set(progress.get("completed_months", []))
+    return [month for month in reversed(get_all_months()) if month not in completed][:count]
 
 
 def get_next_month_to_process(progress):
     """Determine next month that hasn't been fetched"""
-    all_months = get_all_months()
-    completed = set(progress.get("completed_months", []))
-    
-    # Find first uncompleted month (going backwards from most recent)
-    for month in reversed(all_months):
-        if month not in completed:
-            return month
-    
-    return None
+    months = get_months_to_process(progress, 1)
+    return months[0] if months else None
+
+
+def datetime_to_mjd(dt: datetime) -> float:
+    """Convert a naive UTC datetime to MJD"""
+    return (dt - MJD_EPOCH) / timedelta(days=1)
+
+
+def mjd_to_datetime(mjd: float) -> datetime:
+    """Convert an MJD to a naive UTC datetime without building an astropy Time"""
+    return MJD_EPOCH + timedelta(days=mjd)
 
 
 def month_to_mjd_range(year_month):
@@ -93,8 +156,8 @@ def month_to_mjd_range(year_month):
         end_dt = datetime(year, month + 1, 1)
     
     # Convert to MJD
-    start_mjd = Time(start_dt).mjd
-    end_mjd = Time(end_dt).mjd
+    start_mjd = datetime_to_mjd(start_dt)
+    end_mjd = datetime_to_mjd(end_dt)
     
     return start_mjd, end_mjd
 
@@ -103,18 +166,18 @@ def month_to_mjd_range(year_month):
 # HELPER FUNCTIONS
 # -------------------------------------------------------
 
-def clean_value(val):
-    """Convert masked/nan values to None for database compatibility"""
-    if val is None:
-        return None
-    if hasattr(val, 'mask') and val.mask:
-        return None
-    if hasattr(val, 'item'):
-        try:
-            return val.item()
-        except:
-            pass
-    return val
+def table_columns(table, names) -> dict:
+    """
+    Pull columns out of an astropy Table as plain Python lists in one pass each.
+    Masked entries come back as None, so rows need no per-value mask checks.
+    """
+    return {name: table[name].tolist() for name in names if name in table.colnames}
+
+
+def table_rows(table, names) -> list[dict]:
+    """Rows of an astropy Table as plain dicts of the named columns (see table_columns)"""
+    columns = table_columns(table, names)
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
 
 
 def mast_to_public_url(uri_or_path: str | None) -> str | None:
@@ -124,39 +187,58 @@ def mast_to_public_url(uri_or_path: str | None) -> str | None:
     if uri_or_path.startswith("http"):
         return uri_or_path
     if uri_or_path.startswith("mast:"):
-        return f"https://mast.stsci.edu/api/v0.1/Download/file?uri={uri_or_path}"
-    if uri_or_path.lower().endswith((".fits", ".jpg", ".jpeg", ".png")):
-        return f"https://mast.stsci.edu/api/v0.1/Download/file?uri=mast:JWST/product/{uri_or_path}"
+        return MAST_DOWNLOAD_URL + uri_or_path
+    if uri_or_path.lower().endswith(PRODUCT_FILE_EXTENSIONS):
+        return MAST_DOWNLOAD_URL + "mast:JWST/product/" + uri_or_path
     return None
 
 
-def extract_preview_url(prod: dict) -> str | None:
-    """Select best preview URL."""
-    if prod.get("jpegURL"):
-        return mast_to_public_url(prod["jpegURL"])
-    if prod.get("pngURL"):
-        return mast_to_public_url(prod["pngURL"])
-    uri = prod.get("dataURI")
-    if uri and prod.get("dataproduct_type") == "image":
-        return mast_to_public_url(uri)
-    filename = prod.get("productFilename")
-    if filename:
-        return mast_to_public_url(filename)
-    return None
+def fetch_product_lists(obs_rows):
+    """
+    Fetch the products of several observations in one MAST request, as plain
+    dicts grouped by parent obsid. Transient errors are retried with capped,
+    jittered backoff; any other error, or the last failed try, is raised so the
+    month fails and is retried on the next run instead of losing the batch.
+    """
+    delay = 1
+    for attempt in range(PRODUCT_ATTEMPTS):
+        try:
+            products = Observations.get_product_list(obs_rows)
+            break
+        except TRANSIENT_MAST_ERRORS:
+            if attempt == PRODUCT_ATTEMPTS - 1:
+                raise
+            # Jitter keeps the worker threads from retrying in lockstep
+            time.sleep(delay + random.uniform(0, delay / 2))
+            delay = min(delay * 2, RETRY_MAX_DELAY)
+    
+    grouped = {}
+    for prod in table_rows(products, PRODUCT_FIELDS + ("parent_obsid",)):
+        grouped.setdefault(str(prod["parent_obsid"]), []).append(prod)
+    return grouped
 
 
-def extract_fits_url(prod: dict) -> str | None:
-    """Select best FITS file URL."""
+def extract_urls(prod: dict) -> tuple[str | None, str | None]:
+    """Select the best preview URL and FITS file URL, reading each field once."""
     uri = prod.get("dataURI")
-    if uri and uri.lower().endswith(".fits"):
-        return mast_to_public_url(uri)
     filename = prod.get("productFilename")
-    if filename and filename.lower().endswith(".fits"):
-        return mast_to_public_url(filename)
-    data_url = prod.get("dataURL")
-    if data_url and data_url.lower().endswith(".fits"):
-        return mast_to_public_url(data_url)
-    return None
+    
+    # Preview: JPEG, then PNG, then an image's data URI, then the bare filename
+    preview_source = (
+        prod.get("jpegURL")
+        or prod.get("pngURL")
+        or (uri if uri and prod.get("dataproduct_type") == "image" else None)
+        or filename
+    )
+    
+    # FITS: first of data URI, filename, data URL that names a .fits file
+    fits_source = None
+    for candidate in (uri, filename, prod.get("dataURL")):
+        if candidate and candidate.lower().endswith(FITS_EXTENSION):
+            fits_source = candidate
+            break
+    
+    return mast_to_public_url(preview_source), mast_to_public_url(fits_source)
 
 
 def extract_spectrum_metadata(obs: dict) -> dict:
@@ -167,32 +249,71 @@ def extract_spectrum_metadata(obs: dict) -> dict:
     spectrum_meta = {}
     
     # Spectral resolution (if available)
-    if obs.get('em_res_power'):
-        spectrum_meta['spectral_resolution'] = float(obs['em_res_power'])
+    res_power = obs.get('em_res_power')
+    if res_power:
+        spectrum_meta['spectral_resolution'] = float(res_power)
     
     # Wavelength range (convert from meters to microns if needed)
-    if obs.get('em_min'):
+    em_min = obs.get('em_min')
+    if em_min:
         # MAST stores wavelengths in meters, convert to microns
-        wl_min = float(obs['em_min'])
+        wl_min = float(em_min)
         spectrum_meta['wavelength_min'] = wl_min * 1e6 if wl_min < 0.001 else wl_min
     
-    if obs.get('em_max'):
-        wl_max = float(obs['em_max'])
+    em_max = obs.get('em_max')
+    if em_max:
+        wl_max = float(em_max)
         spectrum_meta['wavelength_max'] = wl_max * 1e6 if wl_max < 0.001 else wl_max
     
     # Grating/disperser information (often in filters field for spectra)
-    filters = clean_value(obs.get("filters"))
-    if filters:
-        # JWST gratings: PRISM, G140M, G235M, G395M, G140H, G235H, G395H, etc.
-        grating_keywords = ['PRISM', 'G140', 'G235', 'G395', 'G150', 'G235']
-        for keyword in grating_keywords:
-            if keyword in filters.upper():
-                spectrum_meta['grating'] = filters
-                break
+    filters = obs.get("filters")
+    if filters and GRATING_PATTERN.search(filters):
+        spectrum_meta['grating'] = filters
     
     return spectrum_meta
 
 
+def configure_mast_sessions():
+    """
+    Size the connection pools of astroquery's keep-alive sessions for our thread
+    pools, so concurrent MAST requests reuse connections instead of reconnecting
+    once the default pool of 10 is full.
+    """
+    for client, workers in ((Mast, QUERY_SLICES), (Observations, PRODUCT_WORKERS)):
+        client._session.mount("https://", HTTPAdapter(pool_maxsize=MONTH_WORKERS * workers))
+
+
+def query_observations(t_min_range):
+    """
+    Query MAST for public JWST images and spectra whose t_min falls in the given MJD range.
+    Filters are built exactly as Observations.query_criteria builds them (astroquery is
+    pinned), but only QUERY_COLUMNS are requested and transferred.
+    """
+    _, filters = Observations._parse_caom_criteria(
+        obs_collection="JWST",
+        dataproduct_type=["image", "spectrum"],
+        calib_level=[2, 3],
+        dataRights="PUBLIC",
+        t_min=list(t_min_range)
+    )
+    return Mast.service_request("Mast.Caom.Filtered", {"columns": QUERY_COLUMNS, "filters": filters})
+
+
+def query_month(start_mjd, end_mjd):
+    """
+    Query an MJD range as QUERY_SLICES concurrent sub-range requests and stack
+    the results. Ranges are inclusive, so rows on a slice edge are de-duplicated.
+    """
+    step = (end_mjd - start_mjd) / QUERY_SLICES
+    edges = [start_mjd + step * i for i in range(QUERY_SLICES)] + [end_mjd]
+    with ThreadPoolExecutor(max_workers=QUERY_SLICES) as pool:
+        tables = [table for table in pool.map(query_observations, zip(edges, edges[1:])) if len(table)]
+    
+    if not tables:
+        return Table()
+    return unique(vstack(tables, metadata_conflicts="silent"), keys="obsid")
+
+
 # -------------------------------------------------------
 # MAIN FETCH LOGIC
 # -------------------------------------------------------
@@ -206,15 +327,9 @@ def fetch_month(year_month: str, limit=MAX_RESULTS):
     # Get MJD range for this month
     start_mjd, end_mjd = month_to_mjd_range(year_month)
     
-    # Query MAST for this specific month - NOW INCLUDING SPECTRA
+    # Query MAST for this specific month - images and spectra, in concurrent slices
     print(f"🔍 Querying MAST for observations in {year_month}...")
-    obs_table = Observations.query_criteria(
-        obs_collection="JWST",
-        dataproduct_type=["image", "spectrum"],  # ← NOW INCLUDES SPECTRA!
-        calib_level=[2, 3],
-        dataRights="PUBLIC",
-        t_min=[start_mjd, end_mjd]
-    )
+    obs_table = query_month(start_mjd, end_mjd)
     
     print(f"📊 Found {len(obs_table)} observations for {year_month}")
     
@@ -222,9 +337,13 @@ def fetch_month(year_month: str, limit=MAX_RESULTS):
         print(f"⚠️  No observations found for {year_month} - marking as complete")
         return 0, 0, 0
     
+    # Convert the columns we use to native Python values once, not per row and field
+    rows = table_rows(obs_table, OBSERVATION_FIELDS)
+    
     # Count by type
-    image_count = sum(1 for obs in obs_table if obs.get('dataproduct_type') == 'image')
-    spectrum_count = sum(1 for obs in obs_table if obs.get('dataproduct_type') == 'spectrum')
+    product_types = [obs.get('dataproduct_type') for obs in rows]
+    image_count = product_types.count('image')
+    spectrum_count = product_types.count('spectrum')
     print(f"   📷 Images: {image_count}")
     print(f"   📊 Spectra: {spectrum_count}")
     
@@ -234,37 +353,53 @@ def fetch_month(year_month: str, limit=MAX_RESULTS):
     updated = 0
     skipped = 0
     processed = 0
+    pending = []
 
     # Load existing obs_ids to skip updates
     existing_obs_ids = set(
         r[0] for r in db.query(JWSTObservation.obs_id)
                      .filter(JWSTObservation.obs_id.in_(
-                         [clean_value(obs.get("obsid") or obs.get("obs_id")) for obs in obs_table]
+                         [obs.get("obsid") or obs.get("obs_id") for obs in rows]
                      ))
                      .all()
     )
+    # Hand the connection back instead of idling in a transaction through the
+    # MAST requests; the session checks one out again for the write
+    db.close()
 
-    for obs in obs_table:
-        processed += 1
+    # Only new observations need a product lookup
+    new_rows = []
+    for index, obs in enumerate(rows):
+        obsid = obs.get("obsid") or obs.get("obs_id")
         
-        obsid = clean_value(obs.get("obsid") or obs.get("obs_id"))
-        if not obsid:
-            skipped += 1
-            continue
-
-        # Skip if already exists
-        if obsid in existing_obs_ids:
-            skipped += 1
-            continue
-
-        # Get product list
-        try:
-            products = Observations.get_product_list(obs)
-        except:
+        # Skip if missing, already exists, or listed twice by MAST
+        if not obsid or obsid in existing_obs_ids:
+            processed += 1
             skipped += 1
             continue
+        
+        existing_obs_ids.add(obsid)
+        new_rows.append((index, obsid, obs))
+
+    # One product request per batch of observations, batches fetched concurrently
+    print(f"📦 Fetching product lists for {len(new_rows)} new observations...")
+    batches = [
+        obs_table[[index for index, _, _ in new_rows[start:start + PRODUCT_BATCH_SIZE]]]
+        for start in range(0, len(new_rows), PRODUCT_BATCH_SIZE)
+    ]
+    products_by_obsid = {}
+    with ThreadPoolExecutor(max_workers=PRODUCT_WORKERS) as pool:
+        for grouped in pool.map(fetch_product_lists, batches):
+            products_by_obsid.update(grouped)
+
+    # One timestamp for the whole month's batch
+    fetched_at = utc_now()
+
+    for _, obsid, obs in new_rows:
+        processed += 1
 
-        if len(products) == 0:
+        products = products_by_obsid.get(str(obsid))
+        if not products:
             skipped += 1
             continue
 
@@ -272,10 +407,9 @@ def fetch_month(year_month: str, limit=MAX_RESULTS):
         preview = None
         fits = None
         for prod in products:
-            if not preview:
-                preview = extract_preview_url(prod)
-            if not fits:
-                fits = extract_fits_url(prod)
+            prod_preview, prod_fits = extract_urls(prod)
+            preview = preview or prod_preview
+            fits = fits or prod_fits
             if preview and fits:
                 break
 
@@ -285,36 +419,51 @@ def fetch_month(year_month: str, limit=MAX_RESULTS):
 
         # Parse date
         obs_date = None
-        if obs.get('t_min'):
+        t_min = obs.get('t_min')
+        if t_min:
             try:
-                t = Time(obs['t_min'], format='mjd')
-                obs_date = t.datetime
-            except:
+                obs_date = mjd_to_datetime(float(t_min))
+            except (TypeError, ValueError, OverflowError):
                 pass
 
         # Get data product type
-        dataproduct_type = clean_value(obs.get("dataproduct_type"))
+        dataproduct_type = obs.get("dataproduct_type")
+
+        # Read each numeric field once
+        ra = obs.get("s_ra")
+        dec = obs.get("s_dec")
+        proposal_id = obs.get("proposal_id")
+        exposure_time = obs.get("t_exptime")
+        calib_level = obs.get("calib_level")
 
         # Prepare base metadata
         metadata = {
             "obs_id": obsid,
-            "target_name": clean_value(obs.get("target_name")),
-            "ra": float(obs.get("s_ra")) if obs.get("s_ra") else None,
-            "dec": float(obs.get("s_dec")) if obs.get("s_dec") else None,
-            "instrument": clean_value(obs.get("instrument_name")),
-            "filter_name": clean_value(obs.get("filters")),
+            "target_name": obs.get("target_name"),
+            "ra": float(ra) if ra else None,
+            "dec": float(dec) if dec else None,
+            "instrument": obs.get("instrument_name"),
+            "filter_name": obs.get("filters"),
             "observation_date": obs_date,
             "preview_url": preview,
             "fits_url": fits,
-            "description": clean_value(obs.get("obs_title")),
-            "proposal_id": clean_value(str(obs.get("proposal_id")) if obs.get("proposal_id") else None),
-            "exposure_time": float(obs.get("t_exptime")) if obs.get("t_exptime") else None,
+            "description": obs.get("obs_title"),
+            "proposal_id": str(proposal_id) if proposal_id else None,
+            "exposure_time": float(exposure_time) if exposure_time else None,
             "dataproduct_type": dataproduct_type,
-            "calib_level": int(obs.get("calib_level")) if obs.get("calib_level") else None,
-            "wavelength_region": clean_value(obs.get("wavelength_region")),
-            "pi_name": clean_value(obs.get("proposal_pi")),
-            "target_classification": clean_value(obs.get("target_classification")),
-            "updated_at": datetime.now(UTC),
+            "calib_level": int(calib_level) if calib_level else None,
+            "wavelength_region": obs.get("wavelength_region"),
+            "pi_name": obs.get("proposal_pi"),
+            "target_classification": obs.get("target_classification"),
+            "updated_at": fetched_at,
+            # Spectrum-specific fields; every row carries them because the
+            # executemany takes its column list from the first row
+            "spectral_resolution": None,
+            "wavelength_min": None,
+            "wavelength_max": None,
+            "grating": None,
+            "dispersion_axis": None,  # Not readily available in MAST metadata
+            "slit_width": None,  # Not readily available in MAST metadata
         }
 
         # Add spectrum-specific metadata if this is a spectrum
@@ -325,20 +474,16 @@ def fetch_month(year_month: str, limit=MAX_RESULTS):
                 "wavelength_min": spectrum_meta.get("wavelength_min"),
                 "wavelength_max": spectrum_meta.get("wavelength_max"),
                 "grating": spectrum_meta.get("grating"),
-                "dispersion_axis": None,  # Not readily available in MAST metadata
-                "slit_width": None,  # Not readily available in MAST metadata
             })
 
-        # Add new observation
-        obj = JWSTObservation(**metadata)
-        db.add(obj)
+        # Queue new observation for a bulk upsert
+        pending.append(metadata)
         added += 1
 
-        # Commit in batches for progress
-        if added % 25 == 0:
-            db.commit()
-            print(f"  Progress: {added} added, {skipped} skipped ({processed}/{len(obs_table)})")
-
+    # Network work is done; write the month in one executemany and one transaction
+    if pending:
+        print(f"💾 Writing {added} new observations ({skipped} skipped)...")
+        db.execute(UPSERT_OBSERVATIONS, pending)
     db.commit()
     db.close()
 
@@ -349,8 +494,19 @@ def fetch_month(year_month: str, limit=MAX_RESULTS):
 # MAIN EXECUTION
 # -------------------------------------------------------
 
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Fetch the next uncompleted months of JWST observations")
+    parser.add_argument(
+        "--months", type=int, default=1,
+        help=f"number of months to fetch in this run, up to {MONTH_WORKERS} at a time (default: 1)"
+    )
+    return parser.parse_args()
+
+
 def main():
     """Main execution with smart month selection"""
+    args = parse_args()
     
     print("\n" + "=" * 60)
     print("🔭 JWST DATA FETCHER - Images & Spectra")
@@ -359,6 +515,8 @@ def main():
     # Initialize database
     init_db()
     
+    configure_mast_sessions()
+    
     # Load progress
     progress = load_progress()
     
@@ -369,28 +527,50 @@ def main():
     
     print(f"\n📊 Current Progress: {completed_count}/{total_count} months completed ({completed_count/total_count*100:.1f}%)")
     
-    # Find next month to process
-    next_month = get_next_month_to_process(progress)
+    # Find next months to process
+    months = get_months_to_process(progress, max(args.months, 1))
     
-    if not next_month:
+    if not months:
         print("\n🎉 ALL MONTHS COMPLETED! Your database is fully backfilled!")
         print(f"📚 Total observations: {progress.get('total_observations', 0)}")
         return
     
-    print(f"📅 Next month to process: {next_month}")
+    print(f"📅 Next month{'s' if len(months) > 1 else ''} to process: {', '.join(months)}")
     print()
     
     try:
-        # Fetch this month's data
-        added, updated, skipped = fetch_month(next_month)
+        # Fetch the months concurrently; each fetch_month uses its own session
+        results = {}
+        failed = []
+        with ThreadPoolExecutor(max_workers=MONTH_WORKERS) as pool:
+            futures = {pool.submit(fetch_month, month): month for month in months}
+            for future in as_completed(futures):
+                month = futures[future]
+                try:
+                    results[month] = future.result()
+                except Exception:
+                    print(f"\n❌ ERROR processing {month}:")
+                    traceback.print_exc()
+                    failed.append(month)
+        
+        added = sum(result[0] for result in results.values())
+        updated = sum(result[1] for result in results.values())
+        skipped = sum(result[2] for result in results.values())
+        
+        # Refresh the API's lookup views and cached responses so new rows show up
+        if added:
+            with engine.begin() as conn:
+                refresh_lookup_views(conn)
+            clear_response_cache()
         
         # Update progress
-        if next_month not in progress["completed_months"]:
-            progress["completed_months"].append(next_month)
+        for month in results:
+            if month not in progress["completed_months"]:
+                progress["completed_months"].append(month)
         
         # Get total observation count
         db = SessionLocal()
-        total_obs = db.query(JWSTObservation).count()
+        total_obs = db.query(func.count(JWSTObservation.id)).scalar()
         db.close()
         
         progress["total_observations"] = total_obs
@@ -400,7 +580,9 @@ def main():
         
         # Summary
         print("\n" + "=" * 60)
-        print(f"✅ {next_month} COMPLETE!")
+        for month in months:
+            if month in results:
+                print(f"✅ {month} COMPLETE!")
         print("=" * 60)
         print(f"   Added: {added} new observations")
         print(f"   Updated: {updated} existing observations")
@@ -409,6 +591,11 @@ def main():
         print()
         print(f"📊 Overall Progress: {len(progress['completed_months'])}/{len(all_months)} months ({len(progress['completed_months'])/len(all_months)*100:.1f}%)")
         
+        if failed:
+            print(f"\n❌ Failed: {', '.join(failed)} (will be retried on the next run)")
+            print("=" * 60 + "\n")
+            sys.exit(1)
+        
         # Show next month
         next_next_month = get_next_month_to_process(progress)
         if next_next_month:
@@ -420,7 +607,7 @@ def main():
         print("=" * 60 + "\n")
         
     except Exception as e:
-        print(f"\n❌ ERROR processing {next_month}:")
+        print(f"\n❌ ERROR processing {', '.join(months)}:")
         traceback.print_exc()
         sys.exit(1)
 
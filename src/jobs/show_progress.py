@@ -5,10 +5,11 @@ Shows detailed breakdown of what's completed and what remains.
 Usage: python src/jobs/show_progress.py
 """
 
-import json
 import os
 from datetime import datetime
 
+import orjson
+
 
 PROGRESS_FILE = "progress.json"
 
@@ -19,25 +20,20 @@ def load_progress():
         return None
     
     try:
-        with open(PROGRESS_FILE, 'r') as f:
-            return json.load(f)
-    except:
+        with open(PROGRESS_FILE, 'rb') as f:
+            return orjson.loads(f.read())
+    except (OSError, ValueError):
         return None
 
 
 def get_all_months():
     """Generate list of all months from Jan 2022 to current month"""
-    months = []
-    start_year = 2022
     current = datetime.now()
-    
-    for year in range(start_year, current.year + 1):
-        for month in range(1, 13):
-            if year == current.year and month > current.month:
-                break
-            months.append(f"{year}-{month:02d}")
-    
-    return months
+    return [
+        f"{year}-{month:02d}"
+        for year in range(2022, current.year + 1)
+        for month in range(1, (current.month if year == current.year else 12) + 1)
+    ]
 
 
 def show_progress():
@@ -73,13 +69,11 @@ def show_progress():
     
     years = {}
     for month in all_months:
-        year = month[:4]
-        if year not in years:
-            years[year] = {"total": 0, "completed": 0, "months": []}
-        years[year]["total"] += 1
-        years[year]["months"].append(month)
+        data = years.setdefault(month[:4], {"total": 0, "completed": 0, "months": []})
+        data["total"] += 1
+        data["months"].append(month)
         if month in completed:
-            years[year]["completed"] += 1
+            data["completed"] += 1
     
     for year in sorted(years.keys()):
         data = years[year]
@@ -92,15 +86,16 @@ def show_progress():
         
         print(f"\n{year}: {bar} {data['completed']}/{data['total']} ({pct:.0f}%)")
         
-        # Show completed months
-        completed_in_year = [m for m in data["months"] if m in completed]
-        pending_in_year = [m for m in data["months"] if m not in completed]
+        # Split the year's months (as MM) into completed and pending in one pass
+        completed_in_year, pending_in_year = [], []
+        for m in data["months"]:
+            (completed_in_year if m in completed else pending_in_year).append(m[5:])
         
         if completed_in_year:
-            print(f"  ✅ Completed: {', '.join([m.split('-')[1] for m in completed_in_year])}")
+            print(f"  ✅ Completed: {', '.join(completed_in_year)}")
         
         if pending_in_year:
-            print(f"  ⏳ Pending: {', '.join([m.split('-')[1] for m in pending_in_year])}")
+            print(f"  ⏳ Pending: {', '.join(pending_in_year)}")
     
     # What's next
     print("\n" + "-" * 70)